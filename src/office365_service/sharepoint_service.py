@@ -1,97 +1,368 @@
+import copy
+import logging
+import math
 import os
+import random
+import shutil
+import threading
 import time
-from functools import wraps
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from types import MethodType
+from typing import Callable
 
+import requests
 from msal import SerializableTokenCache, PublicClientApplication
+from requests.adapters import HTTPAdapter
 from office365.runtime.auth.token_response import TokenResponse
 from office365.runtime.auth.user_credential import UserCredential
 from office365.runtime.client_request_exception import ClientRequestException
 from office365.sharepoint.client_context import ClientContext
 from office365.sharepoint.files.file import File
 from office365.sharepoint.folders.folder import Folder
+from office365.runtime.http.http_method import HttpMethod
 from office365.runtime.http.request_options import RequestOptions
+from office365.runtime.odata.v3.batch_request import ODataBatchV3Request
+from office365.runtime.odata.v3.json_light_format import JsonLightFormat
 
 
-def handle_sharepoint_errors(max_retries: int = 5, delay_seconds: int = 3):
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 60
+# Falhas transitórias de rede que justificam uma nova tentativa; as demais exceções sobem imediatamente
+RETRY_ON = (requests.exceptions.RequestException, ConnectionError, TimeoutError)
+# Código de erro do SharePoint para falta de permissão no recurso (System.UnauthorizedAccessException)
+ACCESS_DENIED_CODE = "-2147024891"
+
+
+def _next_backoff(prev: float, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Próximo intervalo de espera com backoff exponencial e jitter descorrelacionado."""
+    return random.uniform(base, min(cap, max(base, prev * 3)))
+
+
+def _retry_after_seconds(response) -> float | None:
+    """
+    Lê o cabeçalho Retry-After (em segundos ou data HTTP) de uma resposta 429/503.
+
+    Returns:
+        O tempo de espera em segundos, ou None se o servidor não o informou.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    if retry_date.tzinfo is None:
+        retry_date = retry_date.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+
+
+def _acesso_negado(e: ClientRequestException) -> bool:
+    """Indica se um 403 traz o código de acesso negado do SharePoint (-2147024891 / AccessDenied)."""
+    if e.response.status_code != 403:
+        return False
+    detalhe = e.code or e.response.text or ""
+    return ACCESS_DENIED_CODE in detalhe or "AccessDenied" in detalhe
+
+
+def _caminho_remoto(item: File | Folder | str) -> str:
+    """Devolve o caminho relativo ao servidor de um arquivo ou pasta (ou o próprio caminho, se já for um)."""
+    return item if isinstance(item, str) else item.serverRelativeUrl
+
+
+def _escape_odata(valor: str) -> str:
+    """Escapa um texto para uso dentro de uma string literal OData (aspas simples duplicadas)."""
+    return valor.replace("'", "''")
+
+
+_SEM_CACHE = object()
+
+
+class _TTLCache:
+    """
+    Cache LRU de tamanho limitado em que cada entrada expira após um prazo. Um valor None registra
+    uma consulta que não encontrou nada e expira após o prazo negativo, normalmente mais curto.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+
+    def get(self, chave: str, padrao=None):
+        """Devolve o valor guardado, se ainda estiver dentro do prazo de validade, ou padrao."""
+        entrada = self._data.get(chave)
+        if entrada is None:
+            return padrao
+        expira_em, valor = entrada
+        if time.monotonic() > expira_em:
+            self._data.pop(chave, None)
+            return padrao
+        self._data.move_to_end(chave)
+        return valor
+
+    def put(self, chave: str, valor):
+        """Guarda um valor, descartando o menos usado quando o cache estiver cheio."""
+        ttl = self.negative_ttl if valor is None else self.ttl
+        self._data[chave] = (time.monotonic() + ttl, valor)
+        self._data.move_to_end(chave)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, chave: str):
+        self._data.pop(chave, None)
+
+    def discard_value(self, valor):
+        """Remove todas as entradas que guardam exatamente este objeto."""
+        for chave, (_, guardado) in list(self._data.items()):
+            if guardado is valor:
+                self._data.pop(chave, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class _AIMDLimiter:
+    """
+    Controla quantas operações podem ser executadas simultaneamente contra o SharePoint,
+    no esquema AIMD: aumento aditivo a cada sucesso e redução multiplicativa quando o
+    servidor sinaliza sobrecarga (429, 503 ou timeout).
+
+    Chamadas aninhadas na mesma thread reutilizam a vaga já adquirida.
+    """
+
+    def __init__(self, max_concurrency: int = 8, min_concurrency: int = 1, alpha: float = 0.5, beta: float = 0.5):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.alpha = alpha
+        self.beta = beta
+        self.concurrency = float(max_concurrency)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    def __enter__(self):
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        if depth == 0:
+            with self._cond:
+                while self._in_flight >= int(self.concurrency):
+                    self._cond.wait()
+                self._in_flight += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._local.depth -= 1
+        if self._local.depth == 0:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+        return False
+
+    def success(self):
+        with self._cond:
+            self.concurrency = min(self.max_concurrency, self.concurrency + self.alpha)
+            self._cond.notify_all()
+
+    def failure(self):
+        with self._cond:
+            self.concurrency = max(self.min_concurrency, self.concurrency * self.beta)
+
+
+class _IdadeDoPool:
+    """
+    Momento da última renovação do pool de conexões da sessão HTTP. Os serviços das threads são
+    cópias rasas do original e compartilham este objeto com ele, assim como compartilham a sessão.
+    """
+
+    __slots__ = ("renovado_em", "lock")
+
+    def __init__(self):
+        self.renovado_em = time.monotonic()
+        self.lock = threading.Lock()
+
+
+def handle_sharepoint_errors(max_retries: int = 5, delay_seconds: float = BACKOFF_BASE, max_delay: float = BACKOFF_CAP,
+                             clear: bool = True, retry_on: tuple[type[BaseException], ...] = RETRY_ON):
     """
     Decorador para tratar exceções de requisições do SharePoint, com lógica
     de nova autenticação, novas tentativas e controle de timeout.
 
     Args:
         max_retries (int): Número máximo de tentativas para erros recuperáveis.
-        delay_seconds (int): Atraso entre as tentativas.
+        delay_seconds (float): Atraso base do backoff exponencial entre as tentativas.
+        max_delay (float): Atraso máximo entre as tentativas quando o servidor não envia Retry-After.
+        clear (bool): Se deve limpar a fila do ClientContext antes de cada nova tentativa. Métodos
+            somente leitura usam False, e a fila só é limpa se uma tentativa anterior deixou consultas pendentes.
+        retry_on (tuple): Exceções, além das respostas de erro do SharePoint, que levam a uma nova tentativa.
     """
 
     def decorator(func):
-        @wraps(func)
-        def wrapper(self: "SharepointService", *args, **kwargs):
-            last_exception = None
-            for attempt in range(max_retries):
-                try:
-                    self.ctx.clear()
-                    result = func(self, *args, **kwargs)
-                    if attempt > 0:
-                        print(f"Operação concluída com sucesso. Na tenativa {attempt + 1}")
-                    return result
-                except ClientRequestException as e:
-                    last_exception = e
-                    if e.response.status_code == 429:
-                        wait_time = 60 * (attempt + 1)
-                        print(f"Erro 429 (Muitas solicitações) detectado. Aguardando {wait_time} segundos...")
-                        time.sleep(wait_time)
-                        continue
-                    elif e.response.status_code == 403 or e.response.status_code == 401:
-                        print("Erro 403 (Proibido) detectado. Tentando relogar...")
-                        if self.using_device:
-                            self.refresh_device_token()
-                            continue
-                        if not (self.username and self.password):
-                            print("Credenciais não disponíveis para relogin. Abortando.")
-                            raise e
-
-                        if self.login(self.username, self.password):
-                            print("Relogin bem-sucedido. Tentando a operação novamente.")
-                            # Tenta novamente a operação dentro do mesmo loop
-                            continue
-                        else:
-                            print("Falha ao relogar. Abortando.")
-                            raise e
-                    elif e.response.status_code == 503:
-                        print(
-                            f"Erro 503 (Serviço Indisponível). Tentativa {attempt + 1}/{max_retries} em {delay_seconds}s...")
-                        time.sleep(delay_seconds)
-                        continue
-                    else:
-                        print(f"Erro não recuperável encontrado: {e}")
-                        raise e
+        return _Retry(func, max_retries, delay_seconds, max_delay, clear, retry_on)
+
+    return decorator
+
+
+class _Retry:
+    # Método do SharepointService envolvido pela política de novas tentativas de handle_sharepoint_errors.
+    # Como descritor, devolve um método ligado quando acessado por uma instância, como uma função faria.
+    # Os metadados do método original ocupam slots próprios (__module__ vem da classe, que está no mesmo
+    # módulo), então não há __dict__ por instância.
+    __slots__ = ("func", "max_retries", "delay_seconds", "max_delay", "clear", "retry_on",
+                 "__name__", "__qualname__", "__doc__", "__wrapped__")
+
+    def __init__(self, func, max_retries: int, delay_seconds: float, max_delay: float, clear: bool,
+                 retry_on: tuple[type[BaseException], ...]):
+        self.func = func
+        self.max_retries = max_retries
+        self.delay_seconds = delay_seconds
+        self.max_delay = max_delay
+        self.clear = clear
+        self.retry_on = retry_on
+        self.__name__ = func.__name__
+        self.__qualname__ = func.__qualname__
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
 
-                except Exception as e:
-                    if "auth cookies" in str(e).lower():
-                        print("Token expirado detectado. Tentando relogar...")
-                        self.refresh_device_token()
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return MethodType(self, instance)
+
+    def __call__(self, service: "SharepointService", *args, **kwargs):
+        # Os campos da política são lidos dos slots onde são usados; o caminho sem erro lê só três deles.
+        # Referências locais evitam buscas de globais a cada volta do laço de tentativas
+        _sleep = time.sleep
+        _CRE = ClientRequestException
+
+        last_exception = None
+        backoff = self.delay_seconds
+        reautenticado = False
+        for attempt in range(self.max_retries):
+            try:
+                if attempt and (self.clear or service.ctx.has_pending_request):
+                    service.ctx.clear()
+                with service._limiter:
+                    result = self.func(service, *args, **kwargs)
+                service._limiter.success()
+                if attempt > 0:
+                    logger.info("Operação concluída com sucesso. Na tenativa %d", attempt + 1)
+                return result
+            except _CRE as e:
+                last_exception = e
+                if e.response.status_code == 429:
+                    service._limiter.failure()
+                    wait_time = _retry_after_seconds(e.response)
+                    if wait_time is None:
+                        backoff = wait_time = _next_backoff(backoff, self.delay_seconds, self.max_delay)
+                    logger.warning("Erro 429 (Muitas solicitações) detectado. Aguardando %.1f segundos...", wait_time)
+                    _sleep(wait_time)
+                    continue
+                elif e.response.status_code == 403 or e.response.status_code == 401:
+                    # O SharePoint responde AccessDenied também quando os cookies FedAuth/rtFa expiram;
+                    # só depois de renovar a autenticação nesta chamada o erro é tratado como permissão
+                    if reautenticado and _acesso_negado(e):
+                        logger.error("Acesso negado ao recurso: %s", e)
+                        raise
+                    logger.warning("Erro 403 (Proibido) detectado. Tentando relogar...")
+                    if service.using_device:
+                        service.refresh_device_token()
+                        reautenticado = True
                         continue
-                    print(f"Uma exceção inesperada ocorreu: {e}. Tentando novamente em {delay_seconds}s...")
-                    last_exception = e
-                    time.sleep(delay_seconds)
+                    if not (service.username and service.password):
+                        logger.error("Credenciais não disponíveis para relogin. Abortando.")
+                        raise
 
-            print(f"A operação '{func.__name__}' falhou após {max_retries} tentativas.")
-            raise last_exception
+                    # Na primeira vez só renova os cookies; se o erro persistir, refaz o login completo
+                    if not reautenticado and service._reauth():
+                        reautenticado = True
+                        continue
+                    if service.login(service.username, service.password):
+                        logger.info("Relogin bem-sucedido. Tentando a operação novamente.")
+                        reautenticado = True
+                        # Tenta novamente a operação dentro do mesmo loop
+                        continue
+                    else:
+                        logger.error("Falha ao relogar. Abortando.")
+                        raise
+                elif e.response.status_code in (503, 504):
+                    service._limiter.failure()
+                    wait_time = _retry_after_seconds(e.response)
+                    if wait_time is None:
+                        backoff = wait_time = _next_backoff(backoff, self.delay_seconds, self.max_delay)
+                    logger.warning(
+                        "Erro %d (Serviço Indisponível). Tentativa %d/%d em %.1fs...",
+                        e.response.status_code, attempt + 1, self.max_retries, wait_time)
+                    _sleep(wait_time)
+                    continue
+                else:
+                    logger.error("Erro não recuperável encontrado: %s", e)
+                    raise
 
-        return wrapper
+            except self.retry_on as e:
+                if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+                    service._limiter.failure()
+                backoff = _next_backoff(backoff, self.delay_seconds, self.max_delay)
+                logger.warning("Uma exceção inesperada ocorreu: %s. Tentando novamente em %.1fs...", e, backoff)
+                last_exception = e
+                _sleep(backoff)
+            except ValueError as e:
+                # O provedor SAML do office365 (login com usuário e senha) sinaliza cookies de
+                # autenticação expirados com ValueError
+                if "auth cookies" not in str(e).lower():
+                    raise
+                logger.warning("Cookies de autenticação expirados. Tentando relogar...")
+                last_exception = e
+                # Como no 403: primeiro só renova os cookies; se o erro persistir, refaz o login completo
+                if reautenticado or not service._reauth():
+                    if not (service.username and service.password):
+                        logger.error("Credenciais não disponíveis para relogin. Abortando.")
+                        raise
+                    if not service.login(service.username, service.password):
+                        logger.error("Falha ao relogar. Abortando.")
+                        raise
+                reautenticado = True
+                backoff = _next_backoff(backoff, self.delay_seconds, self.max_delay)
+                _sleep(backoff)
 
-    return decorator
+        logger.error("A operação '%s' falhou após %d tentativas.", self.__name__, self.max_retries)
+        raise last_exception
 
 
 class SharepointService:
     CACHE_TOKEN = "cache_token.json"
+    RANGE_SIZE = 16 * 1024 * 1024
+    MAX_RANGE_WORKERS = 8
+    FOLDER_CACHE_SIZE = 128
+    FOLDER_CACHE_TTL = 60
+    FILE_CACHE_SIZE = 256
+    FILE_CACHE_TTL = 60
+    NEGATIVE_CACHE_TTL = 5
+    UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+    DOWNLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    MAX_CONNECTION_AGE = 240
 
-    def __init__(self, site_url: str, timeout_seconds: int = 90):
+    def __init__(self, site_url: str, timeout_seconds: int = 90, max_concurrency: int = 8, rpm_limit: int = 600):
         """
         Inicializa o serviço do SharePoint.
 
         Args:
             site_url (str): A URL do site do SharePoint.
             timeout_seconds (int): O tempo em segundos para o timeout de cada requisição.
+            max_concurrency (int): Número máximo de operações simultâneas permitidas.
+            rpm_limit (int): Número máximo de requisições por minuto enviadas ao site.
         """
         self.scopes = None
         self.authority = None
@@ -101,66 +372,231 @@ class SharepointService:
         self.ctx = ClientContext(self.site_url)
         self.username = None
         self.password = None
+        self._credential = None
         self.timeout = timeout_seconds
+        self._folder_cache = _TTLCache(self.FOLDER_CACHE_SIZE, self.FOLDER_CACHE_TTL, self.NEGATIVE_CACHE_TTL)
+        self._file_cache = _TTLCache(self.FILE_CACHE_SIZE, self.FILE_CACHE_TTL, self.NEGATIVE_CACHE_TTL)
+        self._session = self._create_session()
+        self._idade_pool = _IdadeDoPool()
+        self._limiter = _AIMDLimiter(max_concurrency)
+        self._rpm_limit = rpm_limit
+        self._window = deque()
+        self._throttled_until = 0.0
+        self._rate_lock = threading.Lock()
         self.cache = SerializableTokenCache()
+        self._token_mtime = None
+        self._msal_app = None
         self._load_token()
-        self.ctx.pending_request().beforeExecute += self._set_request_timeout
+        self._bind_context_hooks()
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """Cria a sessão HTTP com pool de conexões persistentes (keep-alive) usada por todas as requisições."""
+        session = requests.Session()
+        # pool_connections conta hosts, não conexões: só o site (e, no máximo, o host de login) é usado.
+        # pool_maxsize cobre os 8 trabalhadores padrão de *_concorrente somados às faixas de um download
+        # em partes (MAX_RANGE_WORKERS). Acima disso, o urllib3 abre conexões avulsas em vez de
+        # bloquear: com pool_block, uma resposta em stream não fechada (p.ex. após uma exceção no meio
+        # de um download_session) prenderia sua conexão e as threads esperariam para sempre
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
+
+    def close(self):
+        """Fecha as conexões mantidas abertas pelo pool da sessão HTTP."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _bind_context_hooks(self):
+        """Registra os hooks de requisição no ClientContext atual."""
+        self._bind_request_hooks(self.ctx.pending_request())
+
+    def _bind_request_hooks(self, client_request):
+        """Faz um ClientRequest do office365 passar pela sessão compartilhada e pelos controles de vazão."""
+        client_request.beforeExecute += self._wait_if_throttled
+        client_request.beforeExecute += self._renew_stale_connections
+        client_request.afterExecute += self._update_rate_limit
+        client_request.execute_request_direct = partial(self._send_request, client_request)
+
+    def _execute_batch(self, items_per_batch: int = 100):
+        """
+        Envia as consultas pendentes do ClientContext agrupadas em requisições OData $batch.
+        Ao contrário de ClientContext.execute_batch, usa a mesma sessão HTTP e os mesmos hooks
+        das demais requisições.
+        """
+        batch_request = ODataBatchV3Request(JsonLightFormat())
+        batch_request.beforeExecute += self.ctx._authenticate_request
+        batch_request.beforeExecute += self.ctx._ensure_form_digest
+        self._bind_request_hooks(batch_request)
+        while self.ctx.has_pending_request:
+            batch_request.execute_query(self.ctx._get_next_query(items_per_batch))
+
+    def _send_request(self, pending_request, request: RequestOptions) -> requests.Response:
+        """
+        Substitui o envio padrão do office365 (que usa requests.get/post avulsos, abrindo uma
+        nova conexão TCP/TLS a cada chamada) pelo envio através da sessão compartilhada.
+        """
+        pending_request.beforeExecute.notify(request)
+        if request.method == HttpMethod.Put or (
+                request.method == HttpMethod.Post and (request.is_bytes or request.is_file)):
+            body = {"data": request.data}
+        elif request.method in (HttpMethod.Post, HttpMethod.Patch):
+            body = {"json": request.data}
+        else:
+            body = {}
+        response = self._session.request(
+            request.method,
+            request.url,
+            headers=request.headers,
+            auth=request.auth,
+            verify=request.verify,
+            proxies=request.proxies,
+            stream=request.stream,
+            # O timeout é fixo por serviço; é aplicado aqui, sem um hook a mais por requisição
+            timeout=getattr(request, "timeout", None) or self.timeout,
+            **body,
+        )
+        response.raise_for_status()
+        return response
+
+    def _renew_stale_connections(self, request_options: RequestOptions):
+        """
+        Descarta as conexões do pool a cada MAX_CONNECTION_AGE segundos, antes que firewalls
+        intermediários as derrubem por inatividade e a próxima requisição fique presa em um timeout.
+        Só as conexões ociosas são fechadas: as que estão em uso por outras threads terminam a
+        resposta atual e são descartadas ao voltar para o pool; as próximas requisições abrem novas.
+        """
+        idade = self._idade_pool
+        if time.monotonic() - idade.renovado_em <= self.MAX_CONNECTION_AGE:
+            return
+        with idade.lock:
+            # Outra thread pode ter renovado o pool enquanto esta aguardava
+            now = time.monotonic()
+            if now - idade.renovado_em > self.MAX_CONNECTION_AGE:
+                idade.renovado_em = now
+                self._session.close()
 
-    def _set_request_timeout(self, request_options: RequestOptions):
+    def _wait_if_throttled(self, request_options: RequestOptions):
         """
-        Este método é chamado antes de cada requisição para injetar o parâmetro de timeout.
+        Bloqueia antes de cada requisição enquanto a janela deslizante de 60 segundos
+        estiver cheia ou o servidor tiver informado que a cota se esgotou.
         """
-        request_options.timeout = self.timeout
+        while True:
+            with self._rate_lock:
+                now = time.monotonic()
+                while self._window and self._window[0] <= now - 60:
+                    self._window.popleft()
+                if len(self._window) >= self._rpm_limit:
+                    wait_time = self._window[0] + 60 - now
+                else:
+                    wait_time = self._throttled_until - now
+                if wait_time <= 0:
+                    self._window.append(now)
+                    return
+            time.sleep(wait_time)
+
+    def _update_rate_limit(self, response: requests.Response):
+        """Usa os cabeçalhos RateLimit-* da resposta para pausar antes de esgotar a cota."""
+        remaining = response.headers.get("RateLimit-Remaining") or response.headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            if int(remaining) > 0:
+                return
+            reset = float(response.headers.get("RateLimit-Reset") or response.headers.get("X-RateLimit-Reset") or 60)
+        except ValueError:
+            return
+        with self._rate_lock:
+            self._throttled_until = max(self._throttled_until, time.monotonic() + reset)
 
     def login(self, username, password):
         """Autentica no site do SharePoint usando as credenciais fornecidas."""
-        print(f"Fazendo login no SharePoint com o usuário {username}...")
+        logger.info("Fazendo login no SharePoint com o usuário %s...", username)
         self.username = username
         self.password = password
         for attempt in range(3):
             try:
                 self.ctx.clear()
-                self.ctx.with_credentials(UserCredential(username, password))
+                self._credential = UserCredential(username, password)
+                self.ctx.with_credentials(self._credential)
                 self.ctx.load(self.ctx.web)
                 self.ctx.execute_query()
-                print("Login realizado com sucesso.")
+                logger.info("Login realizado com sucesso.")
                 return True
             except Exception as e:
-                print(f"Erro ao fazer login: {e}")
+                logger.warning("Erro ao fazer login: %s", e)
                 if attempt < 2:
-                    print(f"Tentando novamente (tentativa {attempt + 1}/3)...")
+                    logger.info("Tentando novamente (tentativa %d/3)...", attempt + 1)
                     time.sleep(3)
                 else:
-                    print("Falha após 3 tentativas. Abortando.")
+                    logger.error("Falha após 3 tentativas. Abortando.")
 
         return False
 
+    def _reauth(self) -> bool:
+        """
+        Reaplica a credencial do último login, para que a próxima requisição obtenha cookies novos.
+        Ao contrário de login, não faz uma requisição só para validar a sessão.
+        """
+        if self._credential is None:
+            return False
+        self.ctx.with_credentials(self._credential)
+        return True
+
     def _load_token(self):
-        if os.path.exists(self.CACHE_TOKEN):
-            self.cache.deserialize(open(self.CACHE_TOKEN, "r").read())
+        try:
+            mtime = os.path.getmtime(self.CACHE_TOKEN)
+        except OSError:
+            return
+        # Só relê o arquivo se ele mudou desde a última leitura/gravação
+        if mtime == self._token_mtime:
+            return
+        with open(self.CACHE_TOKEN, "r") as f:
+            self.cache.deserialize(f.read())
+        self._token_mtime = mtime
 
     def _save_cache(self):
         if self.cache.has_state_changed:
-            with open(self.CACHE_TOKEN, "w") as f:
+            tmp = self.CACHE_TOKEN + ".tmp"
+            with open(tmp, "w") as f:
                 f.write(self.cache.serialize())
+            os.replace(tmp, self.CACHE_TOKEN)
+            self._token_mtime = os.path.getmtime(self.CACHE_TOKEN)
 
     def refresh_device_token(self):
         if self.using_device and self.client_id and self.authority and self.scopes:
             self.login_device_code(self.client_id, self.authority, self.scopes)
 
     def login_device_code(self, client_id: str, authority: str, scopes: list[str]):
+        primeiro_login = not self.using_device
+        # A PublicClientApplication só é recriada se o aplicativo ou a autoridade mudarem; a renovação
+        # feita por refresh_device_token mantém a instância (e o cache de metadados do MSAL)
+        if client_id != self.client_id or authority != self.authority:
+            self._msal_app = None
         self.using_device = True
         self.client_id = client_id
         self.authority = authority
         self.scopes = scopes
-        self.ctx = ClientContext(self.site_url)
+        # Reaproveita o ClientContext (e o pool de conexões); o token em memória é descartado
+        # para que a próxima requisição obtenha um novo
         self.ctx.with_access_token(self._refresh_token)
-        self.ctx.pending_request().beforeExecute += self._set_request_timeout
-        self.ctx.load(self.ctx.web)
-        self.ctx.execute_query()
+        self.ctx.authentication_context._cached_token = None
+        if primeiro_login:
+            self.ctx.load(self.ctx.web)
+            self.ctx.execute_query()
 
     def _refresh_token(self):
-        app = PublicClientApplication(client_id=self.client_id, authority=self.authority, token_cache=self.cache)
+        self._load_token()
+        if self._msal_app is None:
+            self._msal_app = PublicClientApplication(
+                client_id=self.client_id, authority=self.authority, token_cache=self.cache)
+        app = self._msal_app
 
         # tenta renovar silenciosamente
         accounts = app.get_accounts()
@@ -181,63 +617,133 @@ class SharepointService:
 
         return TokenResponse(access_token=access_token, token_type="Bearer", expiresIn=result["expires_in"])
 
-    @handle_sharepoint_errors()
+    @handle_sharepoint_errors(clear=False)
     def obter_pasta(self, caminho_pasta: str) -> Folder | None:
         """Obtém um objeto Folder a partir do seu caminho relativo no servidor."""
+        chave = caminho_pasta.rstrip("/")
+        folder = self._folder_cache.get(chave, _SEM_CACHE)
+        if folder is not _SEM_CACHE:
+            return folder
         try:
             folder = self.ctx.web.get_folder_by_server_relative_url(caminho_pasta)
             folder.get().execute_query()
+            self._folder_cache.put(chave, folder)
             return folder
         except ClientRequestException as e:
             if e.response.status_code == 404:
+                # Guarda a ausência por pouco tempo, para não repetir a mesma consulta em sequência
+                self._folder_cache.put(chave, None)
                 return None
-            raise e
+            raise
 
-    @handle_sharepoint_errors()
-    def listar_arquivos(self, pasta_alvo: Folder | str):
-        """Lista todos os arquivos dentro de uma pasta específica."""
-        if isinstance(pasta_alvo, str):
-            pasta = self.obter_pasta(pasta_alvo)
-            if pasta is None:
-                raise FileNotFoundError(f"A pasta '{pasta_alvo}' não foi encontrada.")
-            pasta_alvo = pasta
+    def _resolve_folder(self, pasta: Folder | str) -> Folder:
+        """Devolve o Folder informado ou, se for um caminho, resolve-o (usando o cache de pastas)."""
+        if not isinstance(pasta, str):
+            return pasta
+        folder = self.obter_pasta(pasta)
+        if folder is None:
+            raise FileNotFoundError(f"A pasta '{pasta}' não foi encontrada.")
+        return folder
+
+    def _invalidar_pasta(self, pasta: Folder | str):
+        """Remove uma pasta do cache, para que a próxima consulta a ela vá ao servidor."""
+        if isinstance(pasta, str):
+            self._folder_cache.pop(pasta.rstrip("/"))
+            return
+        self._folder_cache.pop((pasta.serverRelativeUrl or "").rstrip("/"))
+        self._folder_cache.discard_value(pasta)
+
+    def _invalidar_arquivo(self, *arquivos: File | str):
+        """Remove arquivos do cache, para que a próxima consulta a eles vá ao servidor."""
+        for arquivo in arquivos:
+            if isinstance(arquivo, str):
+                self._file_cache.pop(arquivo)
+                continue
+            if arquivo.serverRelativeUrl:
+                self._file_cache.pop(arquivo.serverRelativeUrl)
+            self._file_cache.discard_value(arquivo)
+
+    def clear_folder_cache(self):
+        """Descarta todas as pastas guardadas em cache."""
+        self._folder_cache.clear()
+
+    def invalidate_cache(self):
+        """Descarta todas as pastas e arquivos guardados em cache."""
+        self.clear_folder_cache()
+        self._file_cache.clear()
+
+    @handle_sharepoint_errors(clear=False)
+    def listar_arquivos(self, pasta_alvo: Folder | str, filter_name: str = None, top: int = None,
+                        select: list[str] = None):
+        """
+        Lista todos os arquivos dentro de uma pasta específica.
+
+        Args:
+            pasta_alvo: Caminho ou objeto Folder a ser listado
+            filter_name: Se informado, o servidor retorna apenas os arquivos cujo nome contém este texto
+            top: Número máximo de arquivos retornados pelo servidor
+            select: Se informado, o servidor retorna apenas estes campos de cada arquivo
+                (por exemplo ["Name", "ServerRelativeUrl", "TimeLastModified", "ModifiedBy/Title"])
+        """
+        pasta_alvo = self._resolve_folder(pasta_alvo)
         files = pasta_alvo.files
-        files.expand(["ModifiedBy"]).get().execute_query()
+        if filter_name:
+            files.filter(f"substringof('{_escape_odata(filter_name)}',Name)")
+        if select:
+            files.select(select)
+        files.expand(["ModifiedBy"])
+        if top:
+            files.top(top).get()
+        else:
+            # Segue as páginas seguintes (__next) na mesma execução, se o servidor paginar o resultado
+            files.get_all()
+        files.execute_query()
         return files
 
-    @handle_sharepoint_errors()
+    @handle_sharepoint_errors(clear=False)
     def obter_arquivo(self, caminho_arquivo: str) -> File | None:
         """Obtém um objeto File a partir do seu caminho relativo no servidor."""
+        file = self._file_cache.get(caminho_arquivo, _SEM_CACHE)
+        if file is not _SEM_CACHE:
+            return file
         try:
-            nome_arquivo = os.path.basename(caminho_arquivo)
-            caminho_arquivo = os.path.dirname(caminho_arquivo)
-            folder = self.obter_pasta(caminho_arquivo)
-            if folder is None:
-                raise FileNotFoundError(f"A pasta '{caminho_arquivo}' não foi encontrada.")
-            files = folder.files
-            files.get().execute_query()
-            if not files:
-                raise FileNotFoundError(f"Nenhum arquivo encontrado na pasta '{caminho_arquivo}'.")
-            for file in files:
-                if file.name == nome_arquivo:
-                    return file
-            return None
+            file = self.ctx.web.get_file_by_server_relative_url(caminho_arquivo)
+            file.get().execute_query()
+            self._file_cache.put(caminho_arquivo, file)
+            return file
         except ClientRequestException as e:
             if e.response.status_code == 404:
+                self._file_cache.put(caminho_arquivo, None)
                 return None
-            raise e
+            raise
 
-    @handle_sharepoint_errors()
-    def listar_pastas(self, pasta_pai: Folder | str):
-        """Lista todas as subpastas dentro de uma pasta pai."""
-        if isinstance(pasta_pai, str):
-            pasta = self.obter_pasta(pasta_pai)
-            if pasta is None:
-                raise FileNotFoundError(f"A pasta '{pasta_pai}' não foi encontrada.")
-            pasta_pai = pasta
+    @handle_sharepoint_errors(clear=False)
+    def listar_pastas(self, pasta_pai: Folder | str, filter_name: str = None, top: int = None,
+                      select: list[str] = None):
+        """
+        Lista todas as subpastas dentro de uma pasta pai.
+
+        Args:
+            pasta_pai: Caminho ou objeto Folder a ser listado
+            filter_name: Se informado, o servidor retorna apenas as subpastas cujo nome contém este texto
+            top: Número máximo de subpastas retornadas pelo servidor
+            select: Se informado, o servidor retorna apenas estes campos de cada subpasta
+                (por exemplo ["Name", "ServerRelativeUrl", "TimeLastModified", "ModifiedBy/Title"])
+        """
+        pasta_pai = self._resolve_folder(pasta_pai)
 
         folders = pasta_pai.folders
-        folders.expand(["ModifiedBy"]).get().execute_query()
+        if filter_name:
+            folders.filter(f"substringof('{_escape_odata(filter_name)}',Name)")
+        if select:
+            folders.select(select)
+        folders.expand(["ModifiedBy"])
+        if top:
+            folders.top(top).get()
+        else:
+            # Segue as páginas seguintes (__next) na mesma execução, se o servidor paginar o resultado
+            folders.get_all()
+        folders.execute_query()
         return folders
 
     @handle_sharepoint_errors()
@@ -253,32 +759,37 @@ class SharepointService:
             O objeto da pasta criada
 
         Raises:
-            Exception: Se a pasta pai não for encontrada
+            FileNotFoundError: Se a pasta pai não for encontrada
+            ValueError: Se nome_pasta não tiver nenhum nome de pasta (vazio ou só "/")
         """
-        if isinstance(pasta_pai, str):
-            pasta = self.obter_pasta(pasta_pai)
-            if pasta is None:
-                raise Exception(f"Pasta {pasta_pai} não encontrada")
-            pasta_pai = pasta
-
-        if "/" in nome_pasta:
-            path_parts = nome_pasta.split("/")
-            current_folder = pasta_pai
+        partes = [parte for parte in nome_pasta.split("/") if parte]
+        if not partes:
+            raise ValueError(f"Nome de pasta inválido: '{nome_pasta}'.")
 
-            for part in path_parts:
-                if part:
-                    current_folder = self.criar_pasta(current_folder, part)
+        pasta_pai = self._resolve_folder(pasta_pai)
+        if pasta_pai.serverRelativeUrl is None:
+            pasta_pai.get().execute_query()
+        base = pasta_pai.serverRelativeUrl.rstrip("/")
 
-            return current_folder
-        else:
-            subpastas = self.listar_pastas(pasta_pai)
-            pasta = next((subpasta for subpasta in subpastas if nome_pasta in str(subpasta.name)), None)
-            if pasta is not None:
-                return pasta
-            pasta = pasta_pai.folders.add(nome_pasta)
-            pasta.execute_query()
+        caminho = f"{base}/{'/'.join(partes)}"
+        pasta = self._folder_cache.get(caminho)
+        if pasta is not None:
             return pasta
 
+        # Encadeia um folders.add por nível em uma única execução, sem reentrar no decorador.
+        # Folders.Add devolve a pasta já existente, então os níveis presentes não geram erro e não
+        # precisam ser consultados antes (a consulta a um nível ausente responderia 404)
+        pasta = pasta_pai
+        for parte in partes:
+            pasta = pasta.folders.add(parte)
+        self.ctx.execute_query()
+
+        # Descarta o que o cache sabia sobre os níveis do caminho, inclusive ausências recentes
+        for i in range(len(partes)):
+            self._invalidar_pasta(f"{base}/{'/'.join(partes[:i + 1])}")
+        self._folder_cache.put(caminho, pasta)
+        return pasta
+
     @handle_sharepoint_errors()
     def baixar_arquivo(self, arquivo_sp: File | str, caminho_download: str, max_tentativas: int = 3):
         """
@@ -295,95 +806,219 @@ class SharepointService:
 
         # O decorador @handle_sharepoint_errors em obter_arquivo já tratou erros de API aqui.
         tamanho_remoto = file_to_download.length
-        unique_id = file_to_download.unique_id
+        nome = file_to_download.name
 
         for tentativa in range(max_tentativas):
-            print(f"Iniciando download de '{file_to_download.name}' (Tentativa {tentativa + 1}/{max_tentativas})...")
+            logger.debug("Iniciando download de '%s' (Tentativa %d/%d)...", nome, tentativa + 1, max_tentativas)
 
-            with open(caminho_download, "wb") as local_file:
-                response = self.ctx.execute_request_direct("/Web/GetFileById('{0}')/$value".format(unique_id))
-                data = response.content
-                local_file.write(data)
+            if tamanho_remoto > self.RANGE_SIZE:
+                tamanho_local = self._baixar_em_partes(file_to_download, caminho_download, tamanho_remoto)
+            else:
+                tamanho_local = 0
+
+                def _chunk_baixado(bytes_lidos: int):
+                    nonlocal tamanho_local
+                    tamanho_local = bytes_lidos
 
-            # Verificação do tamanho do arquivo
-            tamanho_local = os.path.getsize(caminho_download)
+                # O download_session baixa em blocos direto para o arquivo, sem carregar tudo na memória
+                with open(caminho_download, "wb", buffering=self.WRITE_BUFFER_SIZE) as local_file:
+                    self._reservar_espaco(local_file, tamanho_remoto)
+                    file_to_download.download_session(
+                        local_file, _chunk_baixado, chunk_size=self.DOWNLOAD_CHUNK_SIZE).execute_query()
 
             if tamanho_local == tamanho_remoto:
-                print(
-                    f"Download de '{file_to_download.name}' concluído e verificado com sucesso. Tamanho: {tamanho_local} bytes.")
+                logger.info(
+                    "Download de '%s' concluído e verificado com sucesso. Tamanho: %d bytes.", nome, tamanho_local)
                 return  # Sucesso, sai da função
             else:
-                print(f"Falha na verificação de tamanho para '{file_to_download.name}'.")
-                print(f"  -> Tamanho esperado: {tamanho_remoto} bytes")
-                print(f"  -> Tamanho baixado:  {tamanho_local} bytes")
+                logger.warning(
+                    "Falha na verificação de tamanho para '%s'. "
+                    "Tamanho esperado: %d bytes, tamanho baixado: %d bytes.", nome, tamanho_remoto, tamanho_local)
 
             if tentativa < max_tentativas - 1:
-                print("Aguardando 5 segundos para tentar novamente...")
+                logger.info("Aguardando 5 segundos para tentar novamente...")
                 time.sleep(5)
+                # Os metadados podem ter vindo do cache; confirma o tamanho atual antes de tentar de novo
+                self._invalidar_arquivo(file_to_download)
+                file_to_download.get().execute_query()
+                tamanho_remoto = file_to_download.length
 
         # Se o loop terminar, todas as tentativas falharam.
-        print(f"Falha ao baixar o arquivo '{file_to_download.name}' após {max_tentativas} tentativas.")
+        logger.error("Falha ao baixar o arquivo '%s' após %d tentativas.", nome, max_tentativas)
 
         # Tenta remover o arquivo parcial/corrompido
         try:
             if os.path.exists(caminho_download):
                 os.remove(caminho_download)
-                print(f"Arquivo parcial '{caminho_download}' removido.")
+                logger.info("Arquivo parcial '%s' removido.", caminho_download)
         except OSError as e:
-            print(f"Não foi possível remover o arquivo parcial '{caminho_download}': {e}")
+            logger.warning("Não foi possível remover o arquivo parcial '%s': %s", caminho_download, e)
 
         raise IOError(
-            f"Não foi possível baixar o arquivo '{file_to_download.name}' com o tamanho correto após {max_tentativas} tentativas.")
+            f"Não foi possível baixar o arquivo '{nome}' com o tamanho correto após {max_tentativas} tentativas.")
+
+    @handle_sharepoint_errors()
+    def baixar_arquivos_lote(self, arquivos: list[tuple[File | str, str]]):
+        """
+        Baixa vários arquivos em uma única chamada: os metadados dos arquivos informados por caminho
+        são resolvidos juntos, em requisições $batch, e cada conteúdo é então transmitido direto para
+        o disco. Indicado para muitos arquivos pequenos.
+
+        Args:
+            arquivos: Pares (arquivo remoto ou seu caminho, caminho local de destino)
+
+        Raises:
+            IOError: Se algum arquivo baixado não tiver o tamanho esperado
+        """
+        remotos = [
+            self.ctx.web.get_file_by_server_relative_url(arquivo).get() if isinstance(arquivo, str) else arquivo
+            for arquivo, _ in arquivos
+        ]
+        pendentes = sum(isinstance(arquivo, str) for arquivo, _ in arquivos)
+        if pendentes > 1:
+            self._execute_batch()
+        elif pendentes:
+            self.ctx.execute_query()
+
+        falhas = []
+        for arquivo, (_, caminho_download) in zip(remotos, arquivos):
+            tamanho_local = 0
+
+            def _chunk_baixado(bytes_lidos: int):
+                nonlocal tamanho_local
+                tamanho_local = bytes_lidos
+
+            # O download_session responde ao próximo afterExecute do contexto, então cada download
+            # precisa ser executado antes de enfileirar o seguinte
+            with open(caminho_download, "wb", buffering=self.WRITE_BUFFER_SIZE) as local_file:
+                arquivo.download_session(
+                    local_file, _chunk_baixado, chunk_size=self.DOWNLOAD_CHUNK_SIZE).execute_query()
+            if arquivo.length is not None and tamanho_local != arquivo.length:
+                falhas.append(arquivo.name)
+
+        if falhas:
+            raise IOError(f"Os arquivos {falhas} não foram baixados com o tamanho correto.")
+
+    @staticmethod
+    def _reservar_espaco(local_file, tamanho: int):
+        """
+        Reserva de uma vez o espaço final do arquivo local, evitando que ele cresça bloco a bloco
+        e que o disco encha no meio do download.
+        """
+        if not tamanho:
+            return
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(local_file.fileno(), 0, tamanho)
+                return
+            except OSError:
+                # Sistemas de arquivos sem suporte a fallocate
+                pass
+        local_file.truncate(tamanho)
+
+    def _baixar_em_partes(self, arquivo: File, caminho_download: str, tamanho: int) -> int:
+        """
+        Baixa um arquivo grande em intervalos (cabeçalho Range) paralelos, cada um gravado
+        diretamente na sua posição do arquivo local.
+
+        Returns:
+            O total de bytes gravados.
+        """
+        partes = min(self.MAX_RANGE_WORKERS, math.ceil(tamanho / self.RANGE_SIZE))
+        tamanho_parte = math.ceil(tamanho / partes)
+        url = "{0}/Web/GetFileById('{1}')/$value".format(self.ctx.service_root_url(), arquivo.unique_id)
+        pending_request = self.ctx.pending_request()
+
+        with open(caminho_download, "wb") as local_file:
+            self._reservar_espaco(local_file, tamanho)
+
+        def _baixar_intervalo(inicio: int) -> int:
+            fim = min(inicio + tamanho_parte, tamanho) - 1
+            request = RequestOptions(url)
+            request.stream = True
+            request.set_header("Range", f"bytes={inicio}-{fim}")
+            try:
+                response = pending_request.execute_request_direct(request)
+            except requests.HTTPError as e:
+                # Mesma conversão feita por ClientRequest.execute_query, para que o decorador trate
+                # 429/503 (Retry-After), 401/403 (novo login) e 404 como nas demais requisições
+                raise ClientRequestException(*e.args, response=e.response)
+            with open(caminho_download, "r+b") as local_file, response:
+                if response.status_code != 206:
+                    raise IOError(f"O servidor não atendeu o intervalo {inicio}-{fim} (status {response.status_code}).")
+                local_file.seek(inicio)
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, local_file, length=1024 * 1024)
+                return local_file.tell() - inicio
+
+        with ThreadPoolExecutor(max_workers=partes) as executor:
+            return sum(executor.map(_baixar_intervalo, range(0, tamanho, tamanho_parte)))
 
     @handle_sharepoint_errors()
-    def enviar_arquivo(self, pasta_destino: Folder | str, arquivo_local: str, nome_arquivo_sp: str = None):
-        """Envia um arquivo local para uma pasta no SharePoint."""
-        if isinstance(pasta_destino, str):
-            pasta = self.obter_pasta(pasta_destino)
-            if pasta is None:
-                raise FileNotFoundError(f"A pasta de destino '{pasta_destino}' não foi encontrada.")
-            pasta_destino = pasta
+    def enviar_arquivo(self, pasta_destino: Folder | str, arquivo_local: str, nome_arquivo_sp: str = None,
+                       progresso: Callable[[int], None] = None):
+        """
+        Envia um arquivo local para uma pasta no SharePoint.
+
+        Arquivos maiores que UPLOAD_CHUNK_SIZE são enviados em blocos por uma sessão de upload;
+        os menores seguem em uma única requisição.
+
+        Args:
+            pasta_destino: Caminho ou objeto Folder de destino
+            arquivo_local: Caminho do arquivo local
+            nome_arquivo_sp: Nome do arquivo no SharePoint (padrão: o nome do arquivo local)
+            progresso: Chamado com o total de bytes já enviados após cada bloco
+        """
+        pasta_destino = self._resolve_folder(pasta_destino)
 
         if not nome_arquivo_sp:
             nome_arquivo_sp = os.path.basename(arquivo_local)
 
+        # Envia em blocos lidos direto do disco, sem carregar o arquivo inteiro na memória
         with open(arquivo_local, 'rb') as file_content:
-            fbytes = file_content.read()
-
-        arquivo = pasta_destino.upload_file(nome_arquivo_sp, fbytes).execute_query()
+            arquivo = pasta_destino.files.create_upload_session(
+                file_content, chunk_size=self.UPLOAD_CHUNK_SIZE, chunk_uploaded=progresso,
+                file_name=nome_arquivo_sp).execute_query()
+        self._invalidar_pasta(pasta_destino)
+        self._invalidar_arquivo(arquivo)
+        if pasta_destino.serverRelativeUrl:
+            self._invalidar_arquivo(f"{pasta_destino.serverRelativeUrl.rstrip('/')}/{nome_arquivo_sp}")
         return arquivo
 
     @handle_sharepoint_errors()
     def mover_arquivo(self, arquivo_origem: File, pasta_destino: Folder | str):
         """Move um arquivo para outra pasta de forma atômica."""
-        if isinstance(pasta_destino, str):
-            pasta = self.obter_pasta(pasta_destino)
-            if pasta is None:
-                raise FileNotFoundError(f"A pasta de destino '{pasta_destino}' não foi encontrada.")
-            pasta_destino = pasta
+        pasta_destino = self._resolve_folder(pasta_destino)
+        origem = arquivo_origem.serverRelativeUrl
 
         novo_arquivo = arquivo_origem.moveto(pasta_destino, flag=1)
         novo_arquivo.execute_query()
+        self._invalidar_pasta(pasta_destino)
+        self._invalidar_arquivo(
+            arquivo_origem, f"{pasta_destino.serverRelativeUrl.rstrip('/')}/{arquivo_origem.name}")
+        if origem:
+            self._invalidar_arquivo(origem)
 
         return novo_arquivo
 
     @handle_sharepoint_errors()
     def copiar_arquivo(self, arquivo_origem: File, pasta_destino: Folder | str):
         """Copia um arquivo para outra pasta."""
-        if isinstance(pasta_destino, str):
-            pasta = self.obter_pasta(pasta_destino)
-            if pasta is None:
-                raise FileNotFoundError(f"A pasta de destino '{pasta_destino}' não foi encontrada.")
-            pasta_destino = pasta
+        pasta_destino = self._resolve_folder(pasta_destino)
 
         novo_arquivo = arquivo_origem.copyto(pasta_destino, True).execute_query()
+        self._invalidar_arquivo(f"{pasta_destino.serverRelativeUrl.rstrip('/')}/{arquivo_origem.name}")
         return novo_arquivo
 
     @handle_sharepoint_errors()
     def renomear_arquivo(self, arquivo: File, novo_nome: str) -> File:
         """Renomeia um arquivo no SharePoint."""
+        origem = arquivo.serverRelativeUrl
         novo_arquivo = arquivo.rename(novo_nome)
         novo_arquivo.execute_query()
+        self._invalidar_arquivo(arquivo)
+        if origem:
+            self._invalidar_arquivo(origem, f"{origem.rsplit('/', 1)[0]}/{novo_nome}")
         return novo_arquivo
 
     @handle_sharepoint_errors()
@@ -392,12 +1027,175 @@ class SharepointService:
         resultado.execute_query()
         return resultado.value.sharingLinkInfo.Url
 
+    def _servico_trabalhador(self) -> "SharepointService":
+        """
+        Cria uma cópia do serviço com um ClientContext próprio, para uso em outra thread.
+        A sessão HTTP, a autenticação, o limitador de concorrência e a cota de requisições
+        continuam compartilhados com o serviço original.
+        """
+        servico = copy.copy(self)
+        servico.ctx = ClientContext(self.site_url, auth_context=self.ctx.authentication_context)
+        servico._folder_cache = _TTLCache(self.FOLDER_CACHE_SIZE, self.FOLDER_CACHE_TTL, self.NEGATIVE_CACHE_TTL)
+        servico._file_cache = _TTLCache(self.FILE_CACHE_SIZE, self.FILE_CACHE_TTL, self.NEGATIVE_CACHE_TTL)
+        servico._bind_context_hooks()
+        return servico
+
+    def _executar_concorrente(self, operacao: Callable, tarefas: list[tuple], max_workers: int,
+                              batch_size: int = None) -> list:
+        """
+        Executa operacao(servico, *args) para cada tupla de argumentos em paralelo. Como o
+        ClientContext do office365 não é thread-safe, cada thread usa o seu próprio serviço.
+
+        Args:
+            batch_size: Se informado, as tarefas são executadas em lotes deste tamanho, e cada
+                lote só começa quando o anterior terminar
+
+        Returns:
+            Os resultados, na mesma ordem das tarefas. A primeira falha é propagada.
+        """
+        local = threading.local()
+
+        def _executar(args: tuple):
+            servico = getattr(local, "servico", None)
+            if servico is None:
+                servico = local.servico = self._servico_trabalhador()
+            return operacao(servico, *args)
+
+        tamanho_lote = batch_size or len(tarefas) or 1
+        resultados = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for inicio in range(0, len(tarefas), tamanho_lote):
+                resultados.extend(executor.map(_executar, tarefas[inicio:inicio + tamanho_lote]))
+        return resultados
+
+    def baixar_arquivos_concorrente(self, arquivos: list[File | str], caminho_dir: str, max_workers: int = 8,
+                                    batch_size: int = None) -> list[str]:
+        """
+        Baixa vários arquivos em paralelo para um diretório local.
+
+        Args:
+            arquivos: Arquivos remotos ou seus caminhos
+            caminho_dir: Diretório local de destino
+            max_workers: Número máximo de downloads simultâneos
+            batch_size: Se informado, os downloads são feitos em lotes deste tamanho
+
+        Returns:
+            Os caminhos locais dos arquivos baixados
+        """
+        caminhos = self._caminhos_remotos(arquivos)
+        # URLs do SharePoint sempre usam "/"; os.path só entra na montagem do caminho local
+        tarefas = [(caminho, os.path.join(caminho_dir, caminho.rsplit("/", 1)[-1])) for caminho in caminhos]
+        self._executar_concorrente(SharepointService.baixar_arquivo, tarefas, max_workers, batch_size)
+        return [destino for _, destino in tarefas]
+
+    def enviar_arquivos_concorrente(self, pasta_destino: Folder | str, arquivos_locais: list[str],
+                                    max_workers: int = 8, batch_size: int = None) -> list[File]:
+        """
+        Envia vários arquivos locais em paralelo para uma pasta no SharePoint.
+
+        Args:
+            pasta_destino: Caminho ou objeto Folder de destino
+            arquivos_locais: Caminhos dos arquivos locais
+            max_workers: Número máximo de envios simultâneos
+            batch_size: Se informado, os envios são feitos em lotes deste tamanho
+
+        Raises:
+            FileNotFoundError: Se a pasta de destino não for encontrada
+        """
+        # Resolve o destino uma única vez; as threads apenas o referenciam em seus contextos
+        pasta = self._resolve_folder(pasta_destino)
+        if pasta.serverRelativeUrl is None:
+            pasta.get().execute_query()
+        caminho_pasta = pasta.serverRelativeUrl
+        arquivos = self._executar_concorrente(
+            lambda servico, local: servico.enviar_arquivo(servico._referenciar_pasta(caminho_pasta), local),
+            [(local,) for local in arquivos_locais], max_workers, batch_size)
+        self._invalidar_pasta(pasta)
+        # As threads usam caches próprios; os arquivos guardados aqui podem ter mudado
+        self._file_cache.clear()
+        return arquivos
+
+    def mover_arquivos_concorrente(self, arquivos: list[File | str], pasta_destino: Folder | str,
+                                   max_workers: int = 8, batch_size: int = None) -> list[File]:
+        """Move vários arquivos em paralelo para outra pasta."""
+        pasta, *caminhos = self._caminhos_remotos([pasta_destino, *arquivos])
+        arquivos = self._executar_concorrente(
+            lambda servico, arquivo: servico.mover_arquivo(servico._referenciar_arquivo(arquivo), pasta),
+            [(caminho,) for caminho in caminhos], max_workers, batch_size)
+        self._invalidar_pasta(pasta)
+        # As threads usam caches próprios; os arquivos guardados aqui podem ter mudado
+        self._file_cache.clear()
+        return arquivos
+
+    def copiar_arquivos_concorrente(self, arquivos: list[File | str], pasta_destino: Folder | str,
+                                    max_workers: int = 8, batch_size: int = None) -> list[File]:
+        """Copia vários arquivos em paralelo para outra pasta."""
+        pasta, *caminhos = self._caminhos_remotos([pasta_destino, *arquivos])
+        arquivos = self._executar_concorrente(
+            lambda servico, arquivo: servico.copiar_arquivo(servico._referenciar_arquivo(arquivo), pasta),
+            [(caminho,) for caminho in caminhos], max_workers, batch_size)
+        self._file_cache.clear()
+        return arquivos
+
+    @handle_sharepoint_errors()
+    def _caminhos_remotos(self, itens: list[File | Folder | str]) -> list[str]:
+        """
+        Devolve os caminhos relativos ao servidor dos itens, carregando de uma só vez o
+        ServerRelativeUrl dos objetos que ainda não o trazem.
+        """
+        pendentes = [item for item in itens if not isinstance(item, str) and item.serverRelativeUrl is None]
+        for item in pendentes:
+            self.ctx.load(item, ["ServerRelativeUrl"])
+        if len(pendentes) > 1:
+            self._execute_batch()
+        elif pendentes:
+            self.ctx.execute_query()
+        return [_caminho_remoto(item) for item in itens]
+
+    def _referenciar_pasta(self, caminho_pasta: str) -> Folder:
+        """Referencia uma pasta no ClientContext deste serviço, sem consultar o servidor."""
+        return self.ctx.web.get_folder_by_server_relative_url(caminho_pasta)
+
+    def _referenciar_arquivo(self, caminho_arquivo: str) -> File:
+        """Referencia um arquivo no ClientContext deste serviço, sem consultar o servidor."""
+        return self.ctx.web.get_file_by_server_relative_url(caminho_arquivo)
+
+    def _find_folder(self, pasta_pai: Folder | str, nome: str) -> Folder | None:
+        """Busca no servidor a subpasta com exatamente este nome."""
+        folders = self._resolve_folder(pasta_pai).folders
+        folders.filter(f"Name eq '{_escape_odata(nome)}'").top(1).get().execute_query()
+        return next(iter(folders), None)
+
+    def _find_file(self, pasta: Folder | str, nome: str) -> File | None:
+        """Busca no servidor o arquivo com exatamente este nome."""
+        files = self._resolve_folder(pasta).files
+        files.filter(f"Name eq '{_escape_odata(nome)}'").top(1).get().execute_query()
+        return next(iter(files), None)
+
+    @handle_sharepoint_errors(clear=False)
     def obter_pasta_por_nome(self, pasta_raiz: Folder, nome):
-        pastas = list(self.listar_pastas(pasta_raiz))
-        pasta_encontrada = next((pasta for pasta in pastas if nome in pasta.name), None)
-        return pasta_encontrada
+        """
+        Busca uma subpasta pelo nome exato, filtrando no servidor: só a pasta encontrada é
+        transmitida, com as mesmas propriedades de obter_pasta.
+        """
+        try:
+            return self._find_folder(pasta_raiz, nome)
+        except ClientRequestException as e:
+            if e.response.status_code != 400:
+                raise
+            # O servidor recusou o $filter; faz a busca na listagem completa
+            return next((pasta for pasta in self.listar_pastas(pasta_raiz) if pasta.name == nome), None)
 
+    @handle_sharepoint_errors(clear=False)
     def obter_arquivo_por_nome(self, pasta: Folder, nome):
-        arquivos = list(self.listar_arquivos(pasta))
-        arquivo_encontrado = next((arquivo for arquivo in arquivos if nome in arquivo.name), None)
-        return arquivo_encontrado
+        """
+        Busca um arquivo pelo nome exato, filtrando no servidor: só o arquivo encontrado é
+        transmitido, com as mesmas propriedades de obter_arquivo.
+        """
+        try:
+            return self._find_file(pasta, nome)
+        except ClientRequestException as e:
+            if e.response.status_code != 400:
+                raise
+            # O servidor recusou o $filter; faz a busca localmente
+            return next((arquivo for arquivo in self.listar_arquivos(pasta) if arquivo.name == nome), None)